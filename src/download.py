@@ -3,37 +3,78 @@
 Simple Series Downloader
 Downloads episodes from YouTube based on YAML configuration
 """
+import argparse
+import collections
+import functools
+import os
 import subprocess
 import re
+import shutil
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, TextIO, Union
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
 
-def load_config(config_path: Path) -> dict:
-    """Load series configuration from YAML file."""
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+try:
+    import yt_dlp
+    from yt_dlp.utils import DownloadCancelled, DownloadError
+except ImportError:
+    # yt-dlp is not importable here; run it as a command instead
+    yt_dlp = None
+
+# Command used when yt_dlp cannot be imported; a standalone yt-dlp skips Python startup
+YT_DLP_CMD = ["yt-dlp"] if shutil.which("yt-dlp") else ["python3", "-m", "yt_dlp"]
+
+# Set on Ctrl-C so downloads already running stop instead of holding the process open
+_CANCEL = threading.Event()
+_running_procs = set()
+_procs_lock = threading.Lock()
+
+_SE_RE = re.compile(r'[Ss](\d+)[Ee](\d+)')
+_LEAD_SE_RE = re.compile(r'^[Ss]\d+[Ee]\d+\s*')
+_NONWORD_RE = re.compile(r'[^\w\s-]')
+_SEPARATOR_RE = re.compile(r'[ _]+')
+
+
+def load_config(source: Union[Path, TextIO]) -> dict:
+    """Load series configuration from a YAML file path or text stream."""
+    if hasattr(source, 'read'):
+        return yaml.load(source, Loader=_YamlLoader)
+    with open(source, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YamlLoader)
 
 
 def sanitize_title(title: str) -> str:
     """Clean title for filename."""
-    title = re.sub(r'[^\w\s-]', '', title)
-    title = title.replace(' ', '_')
-    title = re.sub(r'_+', '_', title)
+    title = _NONWORD_RE.sub('', title)
+    # Spaces become underscores and runs of them collapse in one pass
+    title = _SEPARATOR_RE.sub('_', title)
     return title.strip('_')
 
 
 def parse_episode_info(title: str) -> Tuple[Optional[int], Optional[int]]:
     """Parse season and episode from S##E## format in title."""
-    match = re.search(r'[Ss](\d+)[Ee](\d+)', title)
+    match = _SE_RE.search(title)
     if match:
-        return int(match.group(1)), int(match.group(2))
+        return int(match[1]), int(match[2])
     return None, None
 
 
+@functools.lru_cache(maxsize=None)
+def episode_tag(season: int, episode: int) -> str:
+    """Format season and episode as S##E##."""
+    return f"S{season:02d}E{episode:02d}"
+
+
 def get_episode_numbers(ep: dict) -> Tuple[Optional[int], Optional[int]]:
     """Get season and episode numbers from config or parse from title."""
     if 'season' in ep and 'episode' in ep:
@@ -44,7 +85,7 @@ def get_episode_numbers(ep: dict) -> Tuple[Optional[int], Optional[int]]:
 def generate_filename(config: dict, season: int, episode: int, title: str) -> str:
     """Generate filename based on config pattern."""
     pattern = config.get('naming_pattern', 'S{season:02d}E{episode:02d}_{title}.mp4')
-    clean_title = re.sub(r'^[Ss]\d+[Ee]\d+\s*', '', title)
+    clean_title = _LEAD_SE_RE.sub('', title)
     clean_title = sanitize_title(clean_title)
     return pattern.format(
         season=season,
@@ -63,58 +104,154 @@ def get_season_dir(download_dir: Path, series_name: str, season_num: int, config
     return download_dir / dir_name
 
 
+def _index_season(season_dir: Path) -> Dict[Tuple[int, int], Path]:
+    """Map (season, episode) to the episode files already in a season directory."""
+    index = {}
+    try:
+        entries = os.scandir(season_dir)
+    except OSError:
+        # Missing, not a directory or unreadable: nothing downloaded there yet
+        return index
+    
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith('.mp4'):
+                continue
+            match = _SE_RE.search(entry.name)
+            if match:
+                index[(int(match[1]), int(match[2]))] = Path(entry.path)
+    return index
+
+
+def _cached_season_index(existing: Dict[Path, Dict[Tuple[int, int], Path]],
+                         season_dir: Path) -> Dict[Tuple[int, int], Path]:
+    """Return the index for season_dir from existing, scanning the directory on first use."""
+    season_existing = existing.get(season_dir)
+    if season_existing is None:
+        season_existing = existing[season_dir] = _index_season(season_dir)
+    return season_existing
+
+
 def check_existing_file(season_dir: Path, season: int, episode: int) -> bool:
     """Check if episode already exists."""
-    if not season_dir.exists():
-        return False
-    
-    for file_path in season_dir.glob("*.mp4"):
-        match = re.search(r'[Ss](\d+)[Ee](\d+)', file_path.name)
-        if match and int(match.group(1)) == season and int(match.group(2)) == episode:
-            return True
-    return False
+    return (season, episode) in _index_season(season_dir)
 
 
-def download_episode(video_id: str, season: int, episode: int, title: str,
-                    output_path: Path, config: dict) -> bool:
-    """Download single episode."""
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    if check_existing_file(output_path.parent, season, episode):
-        print(f"  [SKIP] S{season:02d}E{episode:02d} already exists")
-        return True
-    
+def build_yt_dlp_args(config: dict) -> List[str]:
+    """Build yt-dlp command-line options from config."""
     quality = config.get('quality', 1080)
-    cmd = [
-        "python3", "-m", "yt_dlp",
+    args = [
         "--remote-components", "ejs:github",
         "-f", f"best[height<={quality}]",
-        "-o", str(output_path),
-        f"https://www.youtube.com/watch?v={video_id}"
     ]
     
     subtitles = config.get('subtitles', {})
     if subtitles.get('enabled', False):
-        cmd.extend(["--write-sub", "--sub-lang", subtitles.get('lang', 'en')])
+        args.extend(["--write-sub", "--sub-lang", subtitles.get('lang', 'en')])
         if subtitles.get('embed', False):
-            cmd.append("--embed-subs")
+            args.append("--embed-subs")
     
-    print(f"  [DOWNLOAD] S{season:02d}E{episode:02d}: {title[:40]}...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    args.extend(["--concurrent-fragments", str(config.get('concurrent_fragments', 4))])
+    downloader = config.get('external_downloader')
+    if downloader:
+        args.extend(["--downloader", downloader])
+        downloader_args = config.get('external_downloader_args')
+        if downloader_args:
+            args.extend(["--downloader-args", f"{downloader}:{downloader_args}"])
+    return args
+
+
+def build_ydl_opts(yt_dlp_args: List[str]) -> dict:
+    """Build yt_dlp.YoutubeDL options from build_yt_dlp_args output."""
+    # parse_options gives the same ydl options the yt-dlp CLI would use; --abort-on-error
+    # overrides the CLI's ignoreerrors default so failures raise DownloadError
+    return yt_dlp.parse_options(
+        yt_dlp_args + ["--abort-on-error", "--quiet", "--no-warnings", "--no-progress"]
+    ).ydl_opts
+
+
+def cancel_downloads() -> None:
+    """Stop running downloads: yt-dlp commands now, in-process ones at their next progress update."""
+    _CANCEL.set()
+    with _procs_lock:
+        for proc in _running_procs:
+            proc.terminate()
+
+
+def _check_cancelled(status: dict) -> None:
+    """yt_dlp progress hook aborting the download once cancel_downloads was called."""
+    if _CANCEL.is_set():
+        raise DownloadCancelled()
+
+
+def _download_in_process(ydl_opts: dict, output_path: Path, url: str) -> Optional[str]:
+    """Download with the yt_dlp module. Returns an error message on failure."""
+    # Shallow copy so the options shared between workers are left untouched
+    ydl_opts = dict(ydl_opts, outtmpl={**ydl_opts.get('outtmpl', {}), 'default': str(output_path)},
+                    progress_hooks=[*ydl_opts.get('progress_hooks', []), _check_cancelled])
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            if ydl.download([url]) != 0:
+                return "Unknown error"
+    except DownloadCancelled:
+        return "Cancelled"
+    except DownloadError as e:
+        return str(e)
+    return None
+
+
+def _download_subprocess(args: List[str], url: str) -> Optional[str]:
+    """Download by running yt-dlp as a command. Returns an error message on failure."""
+    cmd = [*YT_DLP_CMD, *args, url]
+    # Keep only the last stderr lines instead of buffering the whole log
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    with _procs_lock:
+        _running_procs.add(proc)
+        if _CANCEL.is_set():
+            proc.terminate()
+    try:
+        with proc:
+            tail = collections.deque(proc.stderr, maxlen=20)
+    finally:
+        with _procs_lock:
+            _running_procs.discard(proc)
+    if proc.returncode == 0:
+        return None
+    lines = [line.strip() for line in tail if line.strip()]
+    # Report yt-dlp's own error line rather than any warnings printed around it
+    errors = [line for line in lines if line.startswith('ERROR:')]
+    if errors:
+        return errors[-1]
+    return lines[-1] if lines else "Unknown error"
+
+
+def download_episode(video_id: str, season: int, episode: int, title: str,
+                    output_path: Path, yt_dlp_args: List[str],
+                    ydl_opts: Optional[dict] = None) -> bool:
+    """Download single episode using options from build_yt_dlp_args (and build_ydl_opts)."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    url = f"https://www.youtube.com/watch?v={video_id}"
     
-    if result.returncode == 0:
-        print(f"    ✓ Success")
+    tag = episode_tag(season, episode)
+    print(f"  [DOWNLOAD] {tag}: {title[:40]}...")
+    if yt_dlp is not None:
+        if ydl_opts is None:
+            ydl_opts = build_ydl_opts(yt_dlp_args)
+        error = _download_in_process(ydl_opts, output_path, url)
+    else:
+        error = _download_subprocess(yt_dlp_args + ["-o", str(output_path)], url)
+    
+    if error is None:
+        print(f"    ✓ {tag} Success")
         return True
     else:
-        error = result.stderr[:100] if result.stderr else "Unknown error"
-        print(f"    ✗ Failed: {error}")
+        print(f"    ✗ {tag} Failed: {error[-150:]}")
         return False
 
 
 def main():
     """Main entry."""
-    import argparse
-    
     parser = argparse.ArgumentParser(description='Download series from YouTube')
     parser.add_argument('config', help='Series config name (e.g., numberblocks, peppa_pig)')
     parser.add_argument('--config-dir', default='config/series',
@@ -123,8 +260,12 @@ def main():
                        help='Download directory')
     parser.add_argument('--yes', '-y', action='store_true',
                        help='Skip confirmation prompt')
+    parser.add_argument('--parallel', '-j', type=int, default=5,
+                       help='Number of episodes to download concurrently')
     
     args = parser.parse_args()
+    if args.parallel < 1:
+        parser.error('--parallel must be at least 1')
     
     # Load config
     config_path = Path(args.config_dir) / f"{args.config}.yaml"
@@ -148,11 +289,25 @@ def main():
     
     download_dir = Path(args.download_dir)
     
+    # Index only the season directories this series uses, counting its episodes found there
+    existing = {}
+    present = set()
+    for season_episodes in episodes.values():
+        for ep in season_episodes:
+            season_num, episode_num = get_episode_numbers(ep)
+            if season_num is None or episode_num is None:
+                continue
+            season_dir = get_season_dir(download_dir, series_name, season_num, config)
+            if (season_num, episode_num) in _cached_season_index(existing, season_dir):
+                present.add((season_dir, season_num, episode_num))
+    
     print("=" * 60)
     print(f"Downloading: {series_name}")
     print("=" * 60)
     print(f"Total episodes: {total}")
     print(f"Download directory: {download_dir.absolute()}")
+    print(f"Already downloaded: {len(present)}")
+    print(f"Parallel downloads: {args.parallel}")
     print()
     
     # Confirmation
@@ -164,36 +319,86 @@ def main():
     
     # Download
     success = skipped = failed = 0
+    yt_dlp_args = build_yt_dlp_args(config)
+    # Parse the options once; each download only changes the output template
+    ydl_opts = build_ydl_opts(yt_dlp_args) if yt_dlp is not None else None
     
-    for season_name, season_episodes in episodes.items():
-        print(f"\n{'=' * 60}")
-        print(f"{season_name} ({len(season_episodes)} episodes)")
-        print(f"{'=' * 60}")
+    _CANCEL.clear()
+    pool = ThreadPoolExecutor(max_workers=args.parallel)
+    futures = {}
+    # Later entries for an episode still downloading, tried in turn if it fails
+    duplicates = {}
+    
+    def submit(ep, season_existing, season_dir, season_num, episode_num):
+        """Queue ep for download into season_dir."""
+        filename = generate_filename(config, season_num, episode_num, ep.get('title', f"Episode_{episode_num}"))
+        output_path = season_dir / filename
         
-        for ep in season_episodes:
-            season_num, episode_num = get_episode_numbers(ep)
-            
-            if season_num is None or episode_num is None:
-                print(f"  [WARN] Missing season/episode: {ep.get('title', ep.get('id', 'unknown'))[:40]}")
-                failed += 1
-                continue
-            
-            season_dir = get_season_dir(download_dir, series_name, season_num, config)
-            filename = generate_filename(config, season_num, episode_num, ep.get('title', f"Episode_{episode_num}"))
-            output_path = season_dir / filename
-            
-            result = download_episode(
-                ep['id'], season_num, episode_num, ep.get('title', ''),
-                output_path, config
-            )
+        # Claim the episode now so a duplicate entry is not downloaded alongside it
+        season_existing[(season_num, episode_num)] = output_path
+        future = pool.submit(
+            download_episode,
+            ep['id'], season_num, episode_num, ep.get('title', ''),
+            output_path, yt_dlp_args, ydl_opts
+        )
+        futures[future] = (season_existing, (season_dir, season_num, episode_num))
+    
+    try:
+        for season_name, season_episodes in episodes.items():
+            print(f"\n{'=' * 60}")
+            print(f"{season_name} ({len(season_episodes)} episodes)")
+            print(f"{'=' * 60}")
             
-            if result:
-                if check_existing_file(season_dir, season_num, episode_num):
+            for ep in season_episodes:
+                season_num, episode_num = get_episode_numbers(ep)
+                
+                if season_num is None or episode_num is None:
+                    print(f"  [WARN] Missing season/episode: {ep.get('title', ep.get('id', 'unknown'))[:40]}")
+                    failed += 1
+                    continue
+                
+                season_dir = get_season_dir(download_dir, series_name, season_num, config)
+                season_existing = _cached_season_index(existing, season_dir)
+                key = (season_dir, season_num, episode_num)
+                
+                # Wait for the pending download instead of counting a skip it may not earn
+                if key in duplicates:
+                    duplicates[key].append(ep)
+                    continue
+                
+                if (season_num, episode_num) in season_existing:
+                    print(f"  [SKIP] {episode_tag(season_num, episode_num)} already exists")
                     skipped += 1
-                else:
-                    success += 1
-            else:
-                failed += 1
+                    continue
+                
+                duplicates[key] = []
+                submit(ep, season_existing, season_dir, season_num, episode_num)
+            
+            # Finish the season before printing the next header
+            while futures:
+                for future in as_completed(list(futures)):
+                    season_existing, key = futures.pop(future)
+                    _, season_num, episode_num = key
+                    if future.result():
+                        success += 1
+                        for ep in duplicates.pop(key):
+                            print(f"  [SKIP] {episode_tag(season_num, episode_num)} already exists")
+                            skipped += 1
+                    else:
+                        failed += 1
+                        if duplicates[key]:
+                            # Retry with the next entry for the same episode
+                            submit(duplicates[key].pop(0), season_existing, *key)
+                        else:
+                            del duplicates[key]
+                            del season_existing[(season_num, episode_num)]
+    except KeyboardInterrupt:
+        # Stop the running downloads and don't start the ones still queued for this season
+        cancel_downloads()
+        pool.shutdown(wait=False, cancel_futures=True)
+        print("\nInterrupted.", file=sys.stderr)
+        return 130
+    pool.shutdown()
     
     print(f"\n{'=' * 60}")
     print("SUMMARY")
@@ -1,4 +1,26 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import download
+from download import load_config
+
+NUMBERBLOCKS_CONFIG = Path(__file__).parent.parent / "config" / "series" / "numberblocks.yaml"
+
+
+@pytest.fixture(scope="session")
+def numberblocks_config():
+    """Parsed numberblocks.yaml, loaded once per test session."""
+    if not NUMBERBLOCKS_CONFIG.exists():
+        pytest.skip(f"{NUMBERBLOCKS_CONFIG} not found")
+    return load_config(NUMBERBLOCKS_CONFIG)
+
+
+@pytest.fixture(autouse=True)
+def reset_cancel():
+    """Clear a cancel_downloads() left over from the previous test."""
+    yield
+    download._CANCEL.clear()
@@ -1,9 +1,8 @@
 """Tests for configuration loading and validation."""
-import tempfile
-from pathlib import Path
+import io
 
 import yaml
-from download import load_config
+from download import load_config, get_episode_numbers
 
 
 class TestLoadConfig:
@@ -19,10 +18,7 @@ episodes:
     - title: "S01E01 Test"
       id: "abc123"
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write(config_content)
-            f.flush()
-            config = load_config(Path(f.name))
+        config = load_config(io.StringIO(config_content))
         
         assert config['series_name'] == "Test Series"
         assert config['quality'] == 1080
@@ -41,10 +37,7 @@ episodes:
     - title: "S01E01 Test"
       id: "abc123"
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write(config_content)
-            f.flush()
-            config = load_config(Path(f.name))
+        config = load_config(io.StringIO(config_content))
         
         assert config['subtitles']['enabled'] == True
         assert config['subtitles']['lang'] == "en"
@@ -59,21 +52,23 @@ episodes:
     - title: "S01E01 Test"
       id: "abc123"
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write(config_content)
-            f.flush()
-            config = load_config(Path(f.name))
+        config = load_config(io.StringIO(config_content))
         
         assert config['naming_pattern'] == "{season}_{episode}_{title}.mp4"
         assert config['directory_pattern'] == "Series_{series_name}"
 
-    def test_load_actual_numberblocks_config(self):
-        config_path = Path(__file__).parent.parent / "config" / "series" / "numberblocks.yaml"
-        if config_path.exists():
-            config = load_config(config_path)
-            assert config['series_name'] == "Numberblocks"
-            assert 'episodes' in config
-            assert len(config['episodes']) > 0
+    def test_load_config_from_path(self, tmp_path):
+        config_path = tmp_path / "test.yaml"
+        config_path.write_text('series_name: "Test"\nquality: 720\n', encoding='utf-8')
+        config = load_config(config_path)
+        
+        assert config['series_name'] == "Test"
+        assert config['quality'] == 720
+
+    def test_load_actual_numberblocks_config(self, numberblocks_config):
+        assert numberblocks_config['series_name'] == "Numberblocks"
+        assert 'episodes' in numberblocks_config
+        assert len(numberblocks_config['episodes']) > 0
 
 
 class TestConfigStructure:
@@ -89,10 +84,7 @@ episodes:
       season: 1
       episode: 1
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write(config_content)
-            f.flush()
-            config = load_config(Path(f.name))
+        config = load_config(io.StringIO(config_content))
         
         ep = config['episodes']['Season 1'][0]
         assert 'title' in ep
@@ -110,11 +102,15 @@ episodes:
     - title: "S02E01 Test"
       id: "def456"
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write(config_content)
-            f.flush()
-            config = load_config(Path(f.name))
+        config = load_config(io.StringIO(config_content))
         
         assert len(config['episodes']) == 2
         assert 'Season 1' in config['episodes']
         assert 'Season 2' in config['episodes']
+
+    def test_numberblocks_episodes_have_numbers(self, numberblocks_config):
+        for season_episodes in numberblocks_config['episodes'].values():
+            for ep in season_episodes:
+                assert 'id' in ep
+                season, episode = get_episode_numbers(ep)
+                assert season is not None and episode is not None, ep['title']
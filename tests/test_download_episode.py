@@ -0,0 +1,167 @@
+"""Tests for the download_episode function."""
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import download
+from download import download_episode
+
+
+class FakeDownloadError(Exception):
+    pass
+
+
+class FakeDownloadCancelled(Exception):
+    pass
+
+
+def fake_yt_dlp(calls, error=None, retcode=0):
+    """Stand-in for the yt_dlp module recording what download_episode asks for."""
+
+    class FakeYoutubeDL:
+        def __init__(self, opts):
+            self.opts = opts
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def download(self, urls):
+            calls.append((self.opts, urls))
+            for hook in self.opts.get("progress_hooks", []):
+                hook({"status": "downloading"})
+            if error:
+                raise FakeDownloadError(error)
+            return retcode
+
+    return SimpleNamespace(
+        parse_options=lambda argv: SimpleNamespace(ydl_opts={"argv": argv}),
+        YoutubeDL=FakeYoutubeDL,
+    )
+
+
+class TestInProcessDownload:
+    """Tests for downloads through the yt_dlp module."""
+
+    @pytest.fixture(autouse=True)
+    def fake_errors(self, monkeypatch):
+        monkeypatch.setattr(download, "DownloadError", FakeDownloadError, raising=False)
+        monkeypatch.setattr(download, "DownloadCancelled", FakeDownloadCancelled, raising=False)
+
+    def test_success(self, monkeypatch, tmp_path, capsys):
+        calls = []
+        monkeypatch.setattr(download, "yt_dlp", fake_yt_dlp(calls))
+        output_path = tmp_path / "Season_1_HD" / "S01E01_One.mp4"
+
+        assert download_episode("abc123", 1, 1, "One", output_path, ["-f", "best"]) == True
+        opts, urls = calls[0]
+        assert urls == ["https://www.youtube.com/watch?v=abc123"]
+        assert opts["argv"][:2] == ["-f", "best"]
+        assert "--abort-on-error" in opts["argv"]
+        assert opts["outtmpl"] == {"default": str(output_path)}
+        assert output_path.parent.is_dir()
+        assert "✓ S01E01 Success" in capsys.readouterr().out
+
+    def test_reuses_prebuilt_options(self, monkeypatch, tmp_path):
+        calls = []
+        fake = fake_yt_dlp(calls)
+        fake.parse_options = None
+        monkeypatch.setattr(download, "yt_dlp", fake)
+        ydl_opts = {"format": "best", "outtmpl": {"default": "%(title)s.%(ext)s", "chapter": "c"}}
+
+        for n in (1, 2):
+            output_path = tmp_path / f"S01E0{n}_One.mp4"
+            assert download_episode(f"id{n}", 1, n, "One", output_path, [], ydl_opts) == True
+        assert [opts["outtmpl"]["default"] for opts, _ in calls] == [
+            str(tmp_path / "S01E01_One.mp4"), str(tmp_path / "S01E02_One.mp4")]
+        assert calls[0][0]["outtmpl"]["chapter"] == "c"
+        assert ydl_opts == {"format": "best", "outtmpl": {"default": "%(title)s.%(ext)s", "chapter": "c"}}
+
+    def test_download_error(self, monkeypatch, tmp_path, capsys):
+        monkeypatch.setattr(download, "yt_dlp", fake_yt_dlp([], error="ERROR: Video unavailable"))
+
+        assert download_episode("abc123", 1, 1, "One", tmp_path / "S01E01_One.mp4", []) == False
+        assert "✗ S01E01 Failed: ERROR: Video unavailable" in capsys.readouterr().out
+
+    def test_nonzero_return_code(self, monkeypatch, tmp_path, capsys):
+        monkeypatch.setattr(download, "yt_dlp", fake_yt_dlp([], retcode=1))
+
+        assert download_episode("abc123", 1, 1, "One", tmp_path / "S01E01_One.mp4", []) == False
+        assert "✗ S01E01 Failed: Unknown error" in capsys.readouterr().out
+
+    def test_cancelled(self, monkeypatch, tmp_path, capsys):
+        monkeypatch.setattr(download, "yt_dlp", fake_yt_dlp([]))
+        download.cancel_downloads()
+
+        assert download_episode("abc123", 1, 1, "One", tmp_path / "S01E01_One.mp4", []) == False
+        assert "✗ S01E01 Failed: Cancelled" in capsys.readouterr().out
+
+
+class TestSubprocessDownload:
+    """Tests for downloads through the yt-dlp command."""
+
+    def stub_command(self, monkeypatch, script):
+        monkeypatch.setattr(download, "yt_dlp", None)
+        monkeypatch.setattr(download, "YT_DLP_CMD", [sys.executable, "-c", script])
+
+    def test_success(self, monkeypatch, tmp_path, capsys):
+        self.stub_command(monkeypatch, "import sys; print('progress'); sys.exit(0)")
+
+        assert download_episode("abc123", 1, 1, "One", tmp_path / "S01E01_One.mp4", []) == True
+        assert "✓ S01E01 Success" in capsys.readouterr().out
+
+    def test_failure_reports_stderr_tail(self, monkeypatch, tmp_path, capsys):
+        script = (
+            "import sys\n"
+            "for n in range(30):\n"
+            "    print(f'WARNING: [youtube] abc123: nsig extraction failed: You may experience '\n"
+            "          f'throttling for some formats (attempt {n}); please report this issue on '\n"
+            "          f'https://github.com/yt-dlp/yt-dlp/issues', file=sys.stderr)\n"
+            "print('ERROR: [youtube] abc123: Video unavailable', file=sys.stderr)\n"
+            "print('WARNING: [youtube] Falling back to generic n function search', file=sys.stderr)\n"
+            "sys.exit(1)\n"
+        )
+        self.stub_command(monkeypatch, script)
+
+        assert download_episode("abc123", 1, 1, "One", tmp_path / "S01E01_One.mp4", []) == False
+        failed = [line for line in capsys.readouterr().out.splitlines() if "Failed:" in line]
+        assert failed == ["    ✗ S01E01 Failed: ERROR: [youtube] abc123: Video unavailable"]
+
+    def test_failure_reports_last_line_without_error(self, monkeypatch, tmp_path, capsys):
+        script = (
+            "import sys\n"
+            "print('WARNING: first', file=sys.stderr)\n"
+            "print('Traceback ended with: ' + 'x' * 200, file=sys.stderr)\n"
+            "print('', file=sys.stderr)\n"
+            "sys.exit(1)\n"
+        )
+        self.stub_command(monkeypatch, script)
+
+        assert download_episode("abc123", 1, 1, "One", tmp_path / "S01E01_One.mp4", []) == False
+        failed = [line for line in capsys.readouterr().out.splitlines() if "Failed:" in line]
+        assert failed == ["    ✗ S01E01 Failed: " + "x" * 150]
+
+    def test_failure_without_stderr(self, monkeypatch, tmp_path, capsys):
+        self.stub_command(monkeypatch, "import sys; sys.exit(2)")
+
+        assert download_episode("abc123", 1, 1, "One", tmp_path / "S01E01_One.mp4", []) == False
+        assert "✗ S01E01 Failed: Unknown error" in capsys.readouterr().out
+
+    def test_cancel_terminates_command(self, monkeypatch, tmp_path):
+        self.stub_command(monkeypatch, "import time; time.sleep(30)")
+        results = []
+        worker = threading.Thread(target=lambda: results.append(
+            download_episode("abc123", 1, 1, "One", tmp_path / "S01E01_One.mp4", [])))
+        worker.start()
+        while not download._running_procs:
+            time.sleep(0.01)
+
+        download.cancel_downloads()
+        worker.join(5)
+        assert not worker.is_alive()
+        assert results == [False]
@@ -0,0 +1,41 @@
+"""Tests for existing episode detection."""
+from download import check_existing_file
+
+
+class TestCheckExistingFile:
+    """Tests for check_existing_file function."""
+
+    def test_missing_directory(self, tmp_path):
+        assert check_existing_file(tmp_path / "Season_1_HD", 1, 1) == False
+
+    def test_file_at_directory_path(self, tmp_path):
+        (tmp_path / "Season_1_HD").touch()
+        assert check_existing_file(tmp_path / "Season_1_HD", 1, 1) == False
+
+    def test_matching_file(self, tmp_path):
+        (tmp_path / "S01E02_Another_One.mp4").touch()
+        assert check_existing_file(tmp_path, 1, 2) == True
+
+    def test_other_episode(self, tmp_path):
+        (tmp_path / "S01E02_Another_One.mp4").touch()
+        assert check_existing_file(tmp_path, 1, 3) == False
+        assert check_existing_file(tmp_path, 2, 2) == False
+
+    def test_unpadded_and_lowercase_names(self, tmp_path):
+        (tmp_path / "s1e5_One_Two_Three.mp4").touch()
+        assert check_existing_file(tmp_path, 1, 5) == True
+
+    def test_longer_episode_number(self, tmp_path):
+        (tmp_path / "S01E021_Long_Run.mp4").touch()
+        assert check_existing_file(tmp_path, 1, 2) == False
+        assert check_existing_file(tmp_path, 1, 21) == True
+
+    def test_tag_embedded_in_title(self, tmp_path):
+        (tmp_path / "One_-_S01E01_Numberblocks.mp4").touch()
+        assert check_existing_file(tmp_path, 1, 1) == True
+
+    def test_ignores_non_mp4_files(self, tmp_path):
+        (tmp_path / "S01E01_One.en.vtt").touch()
+        (tmp_path / "S01E01_One.mp4.part").touch()
+        assert check_existing_file(tmp_path, 1, 1) == False
+
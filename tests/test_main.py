@@ -0,0 +1,169 @@
+"""Tests for the main download loop."""
+import sys
+import threading
+from types import SimpleNamespace
+
+import yaml
+
+import download
+
+
+def write_config(config_dir, episodes, **extra):
+    config = {"series_name": "Test Series", "episodes": {"Season 1": episodes}}
+    config.update(extra)
+    config_dir.mkdir(exist_ok=True)
+    (config_dir / "test.yaml").write_text(yaml.safe_dump(config), encoding='utf-8')
+
+
+def run_main(monkeypatch, tmp_path, *args):
+    argv = ["download.py", "test",
+            "--config-dir", str(tmp_path / "config"),
+            "--download-dir", str(tmp_path / "downloads"),
+            "--yes", *args]
+    monkeypatch.setattr(sys, "argv", argv)
+    return download.main()
+
+
+class TestInterrupt:
+    """Tests for Ctrl-C handling in main."""
+
+    def test_interrupt_cancels_downloads(self, monkeypatch, tmp_path):
+        write_config(tmp_path / "config", [
+            {"title": f"S01E{n:02d} Episode", "id": f"id{n}"} for n in range(1, 6)
+        ])
+        started = []
+        running = threading.Event()
+        finished = threading.Event()
+
+        def fake_download(video_id, *args):
+            # Stands in for a long download that only ends when cancelled
+            started.append(video_id)
+            running.set()
+            download._CANCEL.wait(5)
+            finished.set()
+            return False
+
+        def interrupt(futures):
+            running.wait(5)
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(download, "download_episode", fake_download)
+        monkeypatch.setattr(download, "as_completed", interrupt)
+        try:
+            assert run_main(monkeypatch, tmp_path, "--parallel", "1") == 130
+            assert finished.wait(1)
+        finally:
+            download._CANCEL.set()
+        assert started == ["id1"]
+
+
+class TestYtDlpOptions:
+    """Tests for building the yt_dlp options in main."""
+
+    def test_options_parsed_once(self, monkeypatch, tmp_path):
+        write_config(tmp_path / "config", [
+            {"title": f"S01E{n:02d} Episode", "id": f"id{n}"} for n in range(1, 4)
+        ])
+        parsed = []
+        monkeypatch.setattr(download, "yt_dlp", SimpleNamespace(
+            parse_options=lambda argv: parsed.append(argv) or SimpleNamespace(ydl_opts={"argv": argv})))
+        received = []
+        monkeypatch.setattr(download, "download_episode",
+                            lambda *args: received.append(args[-1]) or True)
+
+        assert run_main(monkeypatch, tmp_path) == 0
+        assert len(parsed) == 1
+        assert received == [{"argv": parsed[0]}] * 3
+
+
+class TestDuplicateEntries:
+    """Tests for config entries that resolve to the same episode."""
+
+    def test_duplicate_is_skipped(self, monkeypatch, tmp_path, capsys):
+        write_config(tmp_path / "config", [
+            {"title": "S01E01 One", "id": "first"},
+            {"title": "S01E01 One", "id": "second"},
+        ])
+        calls = []
+        monkeypatch.setattr(download, "download_episode",
+                            lambda video_id, *args: calls.append(video_id) or True)
+
+        assert run_main(monkeypatch, tmp_path, "--parallel", "2") == 0
+        assert calls == ["first"]
+        out = capsys.readouterr().out
+        assert "Downloaded: 1" in out
+        assert "Skipped:    1" in out
+
+    def test_duplicate_retried_after_failure(self, monkeypatch, tmp_path, capsys):
+        write_config(tmp_path / "config", [
+            {"title": "S01E01 One", "id": "first"},
+            {"title": "S01E01 One", "id": "second"},
+        ])
+        calls = []
+        monkeypatch.setattr(download, "download_episode",
+                            lambda video_id, *args: calls.append(video_id) or video_id == "second")
+
+        assert run_main(monkeypatch, tmp_path, "--parallel", "2") == 1
+        assert calls == ["first", "second"]
+        out = capsys.readouterr().out
+        assert "Downloaded: 1" in out
+        assert "Skipped:    0" in out
+        assert "Failed:     1" in out
+
+    def test_failed_episode_is_released(self, monkeypatch, tmp_path, capsys):
+        write_config(tmp_path / "config", [{"title": "S01E01 One", "id": "first"}])
+        config_path = tmp_path / "config" / "test.yaml"
+        config = yaml.safe_load(config_path.read_text(encoding='utf-8'))
+        config["episodes"]["Extras"] = [{"title": "S01E01 One", "id": "retry"}]
+        config_path.write_text(yaml.safe_dump(config, sort_keys=False), encoding='utf-8')
+        calls = []
+        monkeypatch.setattr(download, "download_episode",
+                            lambda video_id, *args: calls.append(video_id) or video_id == "retry")
+
+        assert run_main(monkeypatch, tmp_path) == 1
+        assert calls == ["first", "retry"]
+        out = capsys.readouterr().out
+        assert "Downloaded: 1" in out
+        assert "Failed:     1" in out
+
+
+class TestExistingEpisodes:
+    """Tests for skipping episodes already on disk."""
+
+    def test_nested_directory_pattern(self, monkeypatch, tmp_path, capsys):
+        write_config(tmp_path / "config", [
+            {"title": "S01E01 One", "id": "first"},
+            {"title": "S01E02 Another One", "id": "second"},
+        ], directory_pattern="{series_name}/Season_{season}")
+        season_dir = tmp_path / "downloads" / "Test_Series" / "Season_1"
+        season_dir.mkdir(parents=True)
+        (season_dir / "S01E01_One.mp4").touch()
+        (season_dir / "S01E02_Another_One.mp4").touch()
+        calls = []
+        monkeypatch.setattr(download, "download_episode",
+                            lambda video_id, *args: calls.append(video_id) or True)
+
+        assert run_main(monkeypatch, tmp_path) == 0
+        assert calls == []
+        out = capsys.readouterr().out
+        assert "Downloaded: 0" in out
+        assert "Skipped:    2" in out
+
+    def test_banner_counts_only_this_series(self, monkeypatch, tmp_path, capsys):
+        write_config(tmp_path / "config", [
+            {"title": "S01E01 One", "id": "first"},
+            {"title": "S01E02 Another One", "id": "second"},
+        ], directory_pattern="{series_name}_Season_{season}")
+        downloads = tmp_path / "downloads"
+        (downloads / "Test_Series_Season_1").mkdir(parents=True)
+        (downloads / "Test_Series_Season_1" / "S01E01_One.mp4").touch()
+        (downloads / "Other_Series_Season_1").mkdir()
+        (downloads / "Other_Series_Season_1" / "S01E01_Other.mp4").touch()
+        (downloads / "Other_Series_Season_1" / "S01E02_Other.mp4").touch()
+        monkeypatch.setattr(download, "download_episode", lambda *args: True)
+
+        assert run_main(monkeypatch, tmp_path) == 0
+        out = capsys.readouterr().out
+        assert "Already downloaded: 1" in out
+        assert "Downloaded: 1" in out
+        assert "Skipped:    1" in out
@@ -1,36 +1,37 @@
 """Tests for episode parsing functions."""
-from download import parse_episode_info, get_episode_numbers
+import pytest
+
+from download import parse_episode_info, get_episode_numbers, episode_tag
 
 
 class TestParseEpisodeInfo:
     """Tests for parse_episode_info function."""
 
-    def test_standard_format(self):
-        assert parse_episode_info("S01E01 One") == (1, 1)
-        assert parse_episode_info("S02E15 Ten Green Bottles") == (2, 15)
-        assert parse_episode_info("S10E99 Some Title") == (10, 99)
-
-    def test_lowercase_format(self):
-        assert parse_episode_info("s01e01 One") == (1, 1)
-        assert parse_episode_info("s02e15 Ten Green Bottles") == (2, 15)
-
-    def test_mixed_case_format(self):
-        assert parse_episode_info("S01e01 One") == (1, 1)
-        assert parse_episode_info("s02E15 Ten Green Bottles") == (2, 15)
-
-    def test_embedded_in_title(self):
-        assert parse_episode_info("One | Full Episode - S01E01 | Numberblocks") == (1, 1)
-        assert parse_episode_info("The Third Button - Full Episode | S08E01 | Numberblocks") == (8, 1)
-
-    def test_no_episode_info(self):
-        assert parse_episode_info("One") == (None, None)
-        assert parse_episode_info("Random Title") == (None, None)
-        assert parse_episode_info("") == (None, None)
-
-    def test_edge_cases(self):
-        assert parse_episode_info("S00E01 Special") == (0, 1)
-        assert parse_episode_info("S1E1") == (1, 1)
-        assert parse_episode_info("S99E99") == (99, 99)
+    @pytest.mark.parametrize("title, expected", [
+        # standard format
+        ("S01E01 One", (1, 1)),
+        ("S02E15 Ten Green Bottles", (2, 15)),
+        ("S10E99 Some Title", (10, 99)),
+        # lowercase format
+        ("s01e01 One", (1, 1)),
+        ("s02e15 Ten Green Bottles", (2, 15)),
+        # mixed case format
+        ("S01e01 One", (1, 1)),
+        ("s02E15 Ten Green Bottles", (2, 15)),
+        # embedded in title
+        ("One | Full Episode - S01E01 | Numberblocks", (1, 1)),
+        ("The Third Button - Full Episode | S08E01 | Numberblocks", (8, 1)),
+        # no episode info
+        ("One", (None, None)),
+        ("Random Title", (None, None)),
+        ("", (None, None)),
+        # edge cases
+        ("S00E01 Special", (0, 1)),
+        ("S1E1", (1, 1)),
+        ("S99E99", (99, 99)),
+    ])
+    def test_parse_episode_info(self, title, expected):
+        assert parse_episode_info(title) == expected
 
 
 class TestGetEpisodeNumbers:
@@ -63,3 +64,18 @@ class TestGetEpisodeNumbers:
     def test_empty_episode(self):
         ep = {}
         assert get_episode_numbers(ep) == (None, None)
+
+
+class TestEpisodeTag:
+    """Tests for episode_tag function."""
+
+    def test_zero_padding(self):
+        assert episode_tag(1, 1) == "S01E01"
+        assert episode_tag(0, 5) == "S00E05"
+
+    def test_wide_numbers(self):
+        assert episode_tag(10, 99) == "S10E99"
+        assert episode_tag(1, 100) == "S01E100"
+
+    def test_round_trip(self):
+        assert parse_episode_info(episode_tag(8, 15)) == (8, 15)
@@ -0,0 +1,41 @@
+"""Tests for yt-dlp option building."""
+from download import build_yt_dlp_args
+
+
+class TestBuildYtDlpArgs:
+    """Tests for build_yt_dlp_args function."""
+
+    def test_default_options(self):
+        args = build_yt_dlp_args({})
+        assert args[args.index("-f") + 1] == "best[height<=1080]"
+        assert args[args.index("--remote-components") + 1] == "ejs:github"
+        assert args[args.index("--concurrent-fragments") + 1] == "4"
+        assert "--write-sub" not in args
+        assert "--downloader" not in args
+
+    def test_custom_quality(self):
+        args = build_yt_dlp_args({"quality": 720})
+        assert args[args.index("-f") + 1] == "best[height<=720]"
+
+    def test_subtitles(self):
+        config = {"subtitles": {"enabled": True, "lang": "de", "embed": True}}
+        args = build_yt_dlp_args(config)
+        assert args[args.index("--sub-lang") + 1] == "de"
+        assert "--write-sub" in args
+        assert "--embed-subs" in args
+
+    def test_subtitles_without_embed(self):
+        config = {"subtitles": {"enabled": True}}
+        args = build_yt_dlp_args(config)
+        assert args[args.index("--sub-lang") + 1] == "en"
+        assert "--embed-subs" not in args
+
+    def test_concurrent_fragments(self):
+        args = build_yt_dlp_args({"concurrent_fragments": 8})
+        assert args[args.index("--concurrent-fragments") + 1] == "8"
+
+    def test_external_downloader(self):
+        config = {"external_downloader": "aria2c", "external_downloader_args": "-x 4 -s 4"}
+        args = build_yt_dlp_args(config)
+        assert args[args.index("--downloader") + 1] == "aria2c"
+        assert args[args.index("--downloader-args") + 1] == "aria2c:-x 4 -s 4"